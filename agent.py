@@ -5,46 +5,91 @@ Full Agent - Minimal autonomous agent launcher using Claude Code
 
 import os
 import sys
+import functools
 import subprocess
-import json
+import contextlib
 from pathlib import Path
-from datetime import datetime
-import argparse
-import re
+import signal
+import string
+import time
+
+MEMORY_SUBDIRS = (
+    "core",
+    "learned",
+    "current",
+    "handoffs",
+    "archive",  # For context rotation
+)
+
+# Workspaces whose memory tree was already ensured in this process
+_ensured_workspaces = set()
 
 def ensure_memory_structure(workspace_dir):
     """Ensure memory directory structure exists in workspace"""
-    memory_dirs = [
-        f"{workspace_dir}/.memory/core",
-        f"{workspace_dir}/.memory/learned", 
-        f"{workspace_dir}/.memory/current",
-        f"{workspace_dir}/.memory/handoffs",
-        f"{workspace_dir}/.memory/archive"  # For context rotation
-    ]
-    for dir_path in memory_dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+    workspace_key = str(workspace_dir)
+    if workspace_key in _ensured_workspaces:
+        return
+
+    # Create the shared parent once, then only the leaves; the workspace
+    # itself usually exists already, so skip makedirs' ancestor walk
+    memory_root = os.path.join(workspace_key, ".memory")
+    existing = set()
+    try:
+        os.mkdir(memory_root)
+    except FileExistsError:
+        # One directory listing tells us which leaves are already there
+        with os.scandir(memory_root) as it:
+            existing = {entry.name for entry in it if entry.is_dir()}
+    except FileNotFoundError:  # e.g. a new --workspace path
+        os.makedirs(memory_root, exist_ok=True)
+    for name in MEMORY_SUBDIRS:
+        if name in existing:
+            continue
+        try:
+            os.mkdir(os.path.join(memory_root, name))
+        except FileExistsError:
+            pass
+
+    _ensured_workspaces.add(workspace_key)
+
+# Objective files past this size are truncated (e.g. a log passed by mistake)
+MAX_OBJECTIVE_BYTES = 1 << 20
 
 def load_objective(objective_path):
     """Load objective from file or string"""
-    # First check if it's a file relative to current directory
-    if os.path.isfile(objective_path):
-        with open(objective_path) as f:
-            return f.read().strip()
-    
-    # Check if it's a file relative to agent root
-    agent_root = get_agent_root()
-    agent_relative_path = agent_root / objective_path
-    if agent_relative_path.is_file():
-        with open(agent_relative_path) as f:
-            return f.read().strip()
+    # First check if it's a file relative to current directory, then relative
+    # to agent root; the open itself is the existence check
+    for candidate in (objective_path, os.path.join(get_agent_root(), objective_path)):
+        try:
+            fd = os.open(candidate, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except (OSError, ValueError):  # Missing or not a valid path
+            continue
+        # Read at most one byte past the cap, so oversized files are detected
+        # without ever pulling the whole thing into memory
+        chunks = []
+        remaining = MAX_OBJECTIVE_BYTES + 1
+        try:
+            while remaining > 0:
+                chunk = os.read(fd, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+        except OSError:  # e.g. a directory
+            continue
+        finally:
+            os.close(fd)
+        data = b"".join(chunks)
+        if len(data) > MAX_OBJECTIVE_BYTES:
+            print(f"⚠️ {candidate} is larger than {MAX_OBJECTIVE_BYTES} bytes - using only the start")
+            data = data[:MAX_OBJECTIVE_BYTES]
+        return data.decode("utf-8", errors="replace").strip()
     
     # Otherwise treat as literal objective string
     return objective_path
 
-def create_master_prompt(objective, workspace_dir, resume=False):
-    """Generate the master prompt for Claude"""
-    if resume:
-        resume_context = f"""
+# Master prompt templates, built once at import and filled per launch
+_RESUME_TPL = """
 You are resuming work on an objective. Your workspace is: {workspace_dir}
 
 First, read the memory files to understand:
@@ -55,18 +100,18 @@ First, read the memory files to understand:
 
 Then continue working toward completion.
 """
-    else:
-        resume_context = f"""
+
+_FRESH_TPL = """
 You are starting fresh on this objective:
 {objective}
 
 Your workspace directory is: {workspace_dir}
 All your work should be done within this directory.
 
-First, write this objective to {workspace_dir}/.memory/core/objective.md for future reference.
+This objective has been saved to {workspace_dir}/.memory/core/objective.md for future reference.
 """
-    
-    return f"""You are an autonomous agent with a specific objective to complete.
+
+_BODY_TPL = """You are an autonomous agent with a specific objective to complete.
 
 {resume_context}
 
@@ -482,6 +527,13 @@ If you feel context pressure:
 3. Spawn a sub-agent to continue with: "Continue from checkpoint in {workspace_dir}/.memory/current/checkpoint.md"
 4. Exit immediately
 
+### Shutdown Requests:
+The user can ask you to stop early by creating {workspace_dir}/.memory/current/_shutdown.
+Check for this file between tasks and whenever a sub-agent returns. If it exists:
+1. Write current state to {workspace_dir}/.memory/current/checkpoint.md
+2. Update progress.md with exact status
+3. Exit cleanly - the user will resume later
+
 ## Error Handling & Recovery
 
 When errors occur:
@@ -604,14 +656,102 @@ If truly blocked:
 
 Remember: You are autonomous. Make decisions, implement solutions, and complete the objective."""
 
+def _compile_template(template):
+    """Split a format-style template into pre-encoded (literal, field) parts"""
+    return [(literal.encode(), field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+def _render_template(parts, values):
+    """Join compiled template parts with the given bytes values"""
+    chunks = []
+    for literal, field in parts:
+        chunks.append(literal)
+        if field is not None:
+            chunks.append(values[field])
+    return b"".join(chunks)
+
+_RESUME_PARTS = _compile_template(_RESUME_TPL)
+_FRESH_PARTS = _compile_template(_FRESH_TPL)
+_BODY_PARTS = _compile_template(_BODY_TPL)
+
+def create_master_prompt(objective, workspace_dir, resume=False):
+    """Generate the master prompt for Claude, as UTF-8 bytes"""
+    # surrogateescape, like objective.md, so argv bytes that aren't valid UTF-8 pass through
+    values = {
+        "objective": objective.encode("utf-8", "surrogateescape"),
+        "workspace_dir": os.fsencode(workspace_dir),
+    }
+    values["resume_context"] = _render_template(_RESUME_PARTS if resume else _FRESH_PARTS, values)
+    return _render_template(_BODY_PARTS, values)
+
+# Bump whenever the prompt templates change so cached prompts are re-rendered
+PROMPT_VERSION = "2"
+
+def get_prompt_file(objective, workspace_dir, resume=False):
+    """Return the path of the rendered master prompt, cached in the workspace"""
+    import hashlib
+    key_parts = [PROMPT_VERSION, workspace_dir, "resume" if resume else "fresh"]
+    if not resume:
+        key_parts.append(objective)  # Only the fresh prompt embeds the objective
+    key_bytes = "\0".join(key_parts).encode("utf-8", "surrogateescape")
+    key = hashlib.blake2b(key_bytes, digest_size=8).hexdigest()
+    # Hidden and never mentioned in the prompt, so the agent doesn't read its
+    # own instructions back as memory
+    cache_dir = os.path.join(workspace_dir, ".memory", ".cache")
+    cache_path = os.path.join(cache_dir, f"prompt-{key}.txt")
+    
+    # Reuse the cache only if it was rendered after agent.py last changed
+    try:
+        if os.stat(cache_path).st_mtime >= os.stat(__file__).st_mtime:
+            return cache_path
+    except FileNotFoundError:
+        pass
+    
+    prompt = create_master_prompt(objective, workspace_dir, resume)
+    try:
+        os.mkdir(cache_dir)
+    except FileExistsError:
+        pass
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prompt)
+    os.replace(tmp_path, cache_path)
+    _remove_stale_prompts(workspace_dir, cache_path)
+    return cache_path
+
+def _remove_stale_prompts(workspace_dir, keep_path):
+    """Delete every cached prompt but keep_path, including ones left in core/ by older versions"""
+    memory_dir = os.path.join(workspace_dir, ".memory")
+    for directory, prefix in ((os.path.join(memory_dir, ".cache"), "prompt-"),
+                              (os.path.join(memory_dir, "core"), "_prompt-")):
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith(prefix) and entry.name.endswith(".txt") and entry.path != keep_path:
+                    remove_file(entry.path)
+
+# Maps every ASCII char outside [a-zA-Z0-9-_] to '_' for sanitize_name
+_SANITIZE_ALLOWED = set(string.ascii_letters + string.digits + "-_")
+_SANITIZE_TABLE = str.maketrans(
+    {chr(c): (chr(c) if chr(c) in _SANITIZE_ALLOWED else "_") for c in range(128)}
+)
+
 def sanitize_name(name):
     """Convert objective to safe directory name"""
     # Take first 50 chars, remove special characters
-    safe_name = re.sub(r'[^a-zA-Z0-9-_]', '_', name[:50])
+    # (non-ASCII chars become '?' first so the table maps them to '_' too)
+    safe_name = name[:50].encode("ascii", "replace").decode("ascii").translate(_SANITIZE_TABLE)
     return safe_name.lower().strip('_')
 
+@functools.lru_cache(maxsize=1)
 def get_default_workspace_base():
-    """Get the default workspace base directory"""
+    """Get the default workspace base directory
+    
+    Cached for the life of the process; call
+    get_default_workspace_base.cache_clear() after changing FULL_AGENT_WORKSPACE.
+    """
     # Check for environment variable first
     if "FULL_AGENT_WORKSPACE" in os.environ:
         return Path(os.environ["FULL_AGENT_WORKSPACE"]).absolute()
@@ -619,22 +759,239 @@ def get_default_workspace_base():
     # Use ~/full-agent-workspace as default to avoid polluting the repo
     return Path.home() / "full-agent-workspace"
 
+@functools.lru_cache(maxsize=1)
 def get_agent_root():
     """Get the root directory where agent.py lives"""
     return Path(__file__).parent.absolute()
 
-def check_needs_resume(workspace_dir):
-    """Check if agent needs to resume from checkpoint"""
-    status_file = workspace_dir / ".memory" / "current" / "status.txt"
-    if status_file.exists():
-        with open(status_file) as f:
-            status = f.read().strip()
-            if status == "NEEDS_RESUME":
-                return True
-    return False
-
-def run_agent(objective, workspace=None, resume=False, timeout=None, max_restarts=5):
+# Enough bytes for 50 characters of UTF-8 text
+OBJECTIVE_HEAD_BYTES = 200
+
+def read_objective_head(workspace_path):
+    """Return the first line of a workspace objective (max 50 chars), or None"""
+    obj_path = os.path.join(workspace_path, ".memory", "core", "objective.md")
+    try:
+        fd = os.open(obj_path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        head = os.read(fd, OBJECTIVE_HEAD_BYTES)
+    finally:
+        os.close(fd)
+    return head.split(b"\n", 1)[0].decode("utf-8", errors="ignore").strip()[:50]
+
+def check_needs_resume(status_path):
+    """Check if agent needs to resume from checkpoint, given its status.txt path"""
+    # The status file is a single short word; one raw read is enough
+    try:
+        fd = os.open(status_path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        return os.read(fd, 64).strip() == b"NEEDS_RESUME"
+    finally:
+        os.close(fd)
+
+def remove_file(path):
+    """Delete a file if it exists"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def stop_process_group(proc, sig):
+    """Signal a child started with start_new_session, including its own children"""
+    try:
+        os.killpg(proc.pid, sig)
+    except AttributeError:  # No process groups (Windows)
+        proc.kill()
+    except ProcessLookupError:
+        pass
+
+# How often to wake while the agent runs, to enforce the timeout
+AGENT_POLL_SECONDS = 1
+
+# How long an agent may keep running after writing NEEDS_RESUME
+CHECKPOINT_GRACE_SECONDS = 30
+
+# Shutdown markers of the agents running in this process, for Ctrl-C
+_active_shutdown_paths = set()
+
+def _request_shutdown(signum, frame):
+    """First Ctrl-C: ask every running agent to checkpoint and exit"""
+    signal.signal(signal.SIGINT, signal.default_int_handler)  # Next Ctrl-C forces quit
+    for shutdown_path in _active_shutdown_paths:
+        open(shutdown_path, "a").close()
+    print("\n🛑 Asking agent to checkpoint and exit (Ctrl-C again to force quit)...")
+
+def run_until_complete(coro):
+    """Run a coroutine, turning the first Ctrl-C into a shutdown request"""
+    import asyncio
+    previous_handler = signal.signal(signal.SIGINT, _request_shutdown)
+    try:
+        return asyncio.run(coro)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+async def run_claude(cmd, prompt_file, shutdown_path, timeout=None, cwd=None, output=None,
+                     status_path=None):
+    """Run claude and return its exit code
+    
+    While it runs, Ctrl-C creates shutdown_path so the agent can checkpoint and
+    exit on its own (see run_until_complete). The child is stopped on
+    cancellation and on subprocess.TimeoutExpired, and CHECKPOINT_GRACE_SECONDS
+    after status_path reports a checkpoint if it hasn't exited by then.
+    """
+    import asyncio
+    # Own session, so a terminal Ctrl-C reaches only the launcher
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdin=prompt_file, stdout=output,
+        stderr=None if output is None else asyncio.subprocess.STDOUT,
+        start_new_session=True
+    )
+    
+    _active_shutdown_paths.add(shutdown_path)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    checkpoint_deadline = None
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(proc.wait(), AGENT_POLL_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                # Don't let an agent that checkpointed but lingers hold up the restart
+                if checkpoint_deadline is None:
+                    if status_path is not None and check_needs_resume(status_path):
+                        checkpoint_deadline = now + CHECKPOINT_GRACE_SECONDS
+                elif now >= checkpoint_deadline:
+                    break  # Stopped below
+    finally:
+        _active_shutdown_paths.discard(shutdown_path)
+        if proc.returncode is None:
+            stop_process_group(proc, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(proc.wait(), 5)
+            except asyncio.TimeoutError:
+                stop_process_group(proc, signal.SIGKILL)
+                await proc.wait()
+    return proc.returncode
+
+def print_file(path):
+    """Copy a file to stdout, zero-copy via sendfile where the OS allows it"""
+    sys.stdout.flush()  # Keep already-printed lines ahead of the file
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = 0
+        try:
+            out_fd = sys.stdout.fileno()
+            while offset < size:
+                sent = os.sendfile(out_fd, f.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile (Windows) or unsupported target (e.g. macOS tty)
+            if offset < size:
+                _write_mapped(f, offset)
+        
+        # End on a newline like print() did, so the shell prompt starts on its own line
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+
+def _write_mapped(f, offset):
+    """Write a file from offset to stdout through an mmap rather than a str"""
+    import mmap
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        out = getattr(sys.stdout, "buffer", None)
+        if out is None:  # stdout replaced by a text-only stream
+            sys.stdout.write(mm[offset:].decode(errors="replace"))
+            return
+        with memoryview(mm)[offset:] as view:
+            out.write(view)
+        out.flush()
+
+def create_workspace(objective):
+    """Create a new workspace directory named after the objective"""
+    workspace_base = get_default_workspace_base()
+    
+    # Generate workspace name from objective
+    workspace_name = sanitize_name(objective)
+    
+    # Add timestamp if directory exists (mkdir itself is the existence check);
+    # a random suffix keeps same-second collisions apart, and plain mkdir
+    # gives every workspace the same umask-derived permissions
+    if workspace_name:
+        workspace_dir = workspace_base / workspace_name
+        try:
+            workspace_dir.mkdir(parents=True)
+            return workspace_dir
+        except FileExistsError:
+            pass
+    else:
+        # Nothing usable in the name (e.g. all non-ASCII); never make the
+        # base itself the workspace
+        workspace_base.mkdir(parents=True, exist_ok=True)
+    
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    while True:
+        workspace_dir = workspace_base / f"{workspace_name}_{timestamp}_{os.urandom(4).hex()}"
+        try:
+            workspace_dir.mkdir()
+            return workspace_dir
+        except FileExistsError:
+            continue
+
+# Pointer to the most recently launched workspace, kept in the workspace base
+LAST_WORKSPACE = ".last"
+
+def save_last_workspace(ws):
+    """Atomically record ws as the workspace --resume should pick up
+    
+    Skipped if the workspace base doesn't exist, so a --workspace run
+    elsewhere never creates it as a side effect.
+    """
+    workspace_base = str(get_default_workspace_base())
+    last_path = os.path.join(workspace_base, LAST_WORKSPACE)
+    tmp_path = f"{last_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(ws)
+        os.replace(tmp_path, last_path)
+    except OSError:
+        remove_file(tmp_path)
+
+def read_last_workspace():
+    """Return the last launched workspace if it still has saved state, else None"""
+    try:
+        with open(os.path.join(get_default_workspace_base(), LAST_WORKSPACE)) as f:
+            ws = f.read().strip()
+    except OSError:
+        return None
+    if ws and os.path.exists(os.path.join(ws, ".memory", "core", "objective.md")):
+        return Path(ws)
+    return None
+
+def run_agent(objective, workspace=None, resume=False, timeout=None, max_restarts=5, log_output=False):
     """Launch Claude Code with the objective"""
+    try:
+        return run_until_complete(
+            run_agent_async(objective, workspace, resume, timeout, max_restarts, log_output)
+        )
+    except KeyboardInterrupt:
+        return 0  # run_agent_async already reported where state was saved
+
+async def run_agent_async(objective, workspace=None, resume=False, timeout=None, max_restarts=5,
+                          log_output=False):
+    """Run an agent with auto-restart; log_output sends Claude's output to the workspace"""
+    import asyncio
     restart_count = 0
     
     # Determine workspace directory
@@ -646,96 +1003,141 @@ def run_agent(objective, workspace=None, resume=False, timeout=None, max_restart
         else:
             workspace_dir = Path.cwd() / workspace
     elif resume:
-        # Find existing workspace with saved state
-        workspace_base = get_default_workspace_base()
-        if workspace_base.exists():
-            for dir in workspace_base.iterdir():
-                if (dir / ".memory" / "core" / "objective.md").exists():
-                    workspace_dir = dir.absolute()
-                    break
-            else:
+        # Find existing workspace with saved state, trying the last one used first
+        workspace_dir = read_last_workspace()
+        if workspace_dir is None:
+            workspace_base = get_default_workspace_base()
+            if not workspace_base.exists():
+                print("❌ No workspace directory found")
+                return 1
+            with os.scandir(workspace_base) as it:
+                for entry in it:
+                    # is_dir() comes from the dirent, skipping .last/.index.json for free
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".memory", "core", "objective.md")):
+                        workspace_dir = Path(entry.path).absolute()
+                        break
+            if workspace_dir is None:
                 print("❌ No saved state found. Specify workspace with --workspace")
                 return 1
-        else:
-            print("❌ No workspace directory found")
-            return 1
     else:
-        # Create new workspace based on objective
-        workspace_base = get_default_workspace_base()
-        workspace_base.mkdir(exist_ok=True)
-        
-        # Generate workspace name from objective
-        workspace_name = sanitize_name(objective)
-        workspace_dir = workspace_base / workspace_name
-        
-        # Add timestamp if directory exists
-        if workspace_dir.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            workspace_dir = workspace_base / f"{workspace_name}_{timestamp}"
-        
-        workspace_dir.mkdir(parents=True, exist_ok=True)
+        workspace_dir = create_workspace(objective)
+    
+    # Derive all workspace paths once for the whole restart loop; workspace_dir
+    # stays a Path and ws is its one str conversion, shared by everything below
+    ws = os.fspath(workspace_dir)
+    memory_dir = f"{ws}/.memory"
+    status_path = f"{memory_dir}/current/status.txt"
+    shutdown_path = f"{memory_dir}/current/_shutdown"
+    complete_path = f"{memory_dir}/current/complete.md"
+    output_path = f"{memory_dir}/current/output.log" if log_output else None
     
     # Ensure memory structure exists
-    ensure_memory_structure(workspace_dir)
+    ensure_memory_structure(ws)
+    save_last_workspace(ws)
+    
+    # Persist the objective up front so the agent doesn't spend a turn on it
+    if not resume:
+        objective_path = f"{memory_dir}/core/objective.md"
+        tmp_path = f"{objective_path}.{os.getpid()}.tmp"
+        # surrogateescape round-trips argv bytes that aren't valid UTF-8
+        with open(tmp_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+            f.write(objective)
+        os.replace(tmp_path, objective_path)  # --resume never sees a half-written file
+    
+    # With no timeout or restarts to supervise, hand the process to claude
+    exec_in_place = timeout is None and max_restarts == 1 and output_path is None
     
     # Main execution loop with auto-restart for context management
     while restart_count < max_restarts:
-        # Clear status file if starting fresh
+        # Never start an agent with a stale shutdown request or checkpoint;
+        # a leftover NEEDS_RESUME would get the new agent stopped mid-work
+        remove_file(shutdown_path)
+        remove_file(status_path)
+        
         if restart_count > 0:
-            status_file = workspace_dir / ".memory" / "current" / "status.txt"
-            if status_file.exists():
-                status_file.unlink()
             resume = True  # Force resume mode for restarts
             print(f"\n🔄 Restart {restart_count}/{max_restarts} - Resuming from checkpoint...")
         
         # Generate master prompt
-        prompt = create_master_prompt(objective, str(workspace_dir), resume)
+        prompt_path = get_prompt_file(objective, ws, resume)
         
         # Build command - run in workspace directory
-        # --print for non-interactive mode
+        # --print for non-interactive mode, reading the prompt from stdin
         # --dangerously-skip-permissions to allow all operations without prompting
-        cmd = ["claude", "--print", "--dangerously-skip-permissions", prompt]
+        cmd = ["claude", "--print", "--dangerously-skip-permissions"]
         
+        # The full banner is only for people watching; piped/CI output still
+        # needs to say which workspace was used
         if restart_count == 0:
-            print(f"🚀 Launching autonomous agent...")
-            print(f"📍 Objective: {objective[:100]}..." if len(objective) > 100 else f"📍 Objective: {objective}")
-            print(f"📂 Workspace: {workspace_dir}")
-            print(f"💾 Memory at: {workspace_dir}/.memory/")
-            print(f"🔄 Auto-restart enabled (max {max_restarts} restarts)")
-            print("-" * 50)
+            if not sys.stdout.isatty():
+                print(f"📂 Workspace: {ws}")
+            else:
+                objective_line = f"{objective[:100]}..." if len(objective) > 100 else objective
+                if exec_in_place:
+                    restart_line = "🔄 Auto-restart disabled - running claude in place"
+                else:
+                    restart_line = f"🔄 Auto-restart enabled (max {max_restarts} restarts)"
+                sys.stdout.write(
+                    f"🚀 Launching autonomous agent...\n"
+                    f"📍 Objective: {objective_line}\n"
+                    f"📂 Workspace: {ws}\n"
+                    f"💾 Memory at: {memory_dir}/\n"
+                    f"{restart_line}\n"
+                    f"{'-' * 50}\n"
+                )
+                sys.stdout.flush()
         
         try:
+            if exec_in_place:
+                sys.stdout.flush()
+                with open(prompt_path, "rb") as prompt_file:
+                    os.dup2(prompt_file.fileno(), 0)
+                os.chdir(ws)
+                os.execvp(cmd[0], cmd)  # Only returns by raising
+            
             # Run Claude Code
-            result = subprocess.run(cmd, timeout=timeout)
+            output_file = open(output_path, "ab") if output_path else contextlib.nullcontext()
+            with open(prompt_path, "rb") as prompt_file, output_file as output:
+                returncode = await run_claude(cmd, prompt_file, shutdown_path, timeout,
+                                              cwd=ws, output=output, status_path=status_path)
             
-            if result.returncode == 0:
-                # Check if agent needs to resume (context overflow)
-                if check_needs_resume(workspace_dir):
-                    restart_count += 1
-                    print("\n💾 Agent checkpoint detected - context preservation restart...")
-                    continue
-                
-                print("\n✅ Agent completed successfully")
-                
-                # Check if complete
-                complete_path = workspace_dir / ".memory" / "current" / "complete.md"
-                if complete_path.exists():
-                    print("📄 Reading completion report...")
-                    with open(complete_path) as f:
-                        print(f.read())
+            # Agent stopped after a Ctrl-C shutdown request
+            if os.path.exists(shutdown_path):
+                print(f"\n💾 State saved to {memory_dir}/ - use --resume to continue")
+                break
+            
+            # Check if agent needs to resume (context overflow); this also
+            # covers an agent run_claude stopped after it checkpointed
+            if check_needs_resume(status_path):
+                restart_count += 1
+                print("\n💾 Agent checkpoint detected - context preservation restart...")
+                continue
+            
+            if returncode == 0:
+                # Show the completion report, if the agent wrote a non-empty one
+                try:
+                    has_report = os.stat(complete_path).st_size > 0
+                except OSError:
+                    has_report = False
+                sys.stdout.write(
+                    "\n✅ Agent completed successfully\n"
+                    + ("📄 Reading completion report...\n" if has_report else "")
+                )
+                if has_report:
+                    print_file(complete_path)  # Flushes the lines above first
                 break  # Exit the restart loop
             else:
-                print(f"\n⚠️ Agent exited with code {result.returncode}")
+                print(f"\n⚠️ Agent exited with code {returncode}")
                 break
                 
         except subprocess.TimeoutExpired:
             print(f"\n⏱️ Agent timeout after {timeout} seconds")
-            print(f"💾 State saved to {workspace_dir}/.memory/ - use --resume to continue")
+            print(f"💾 State saved to {memory_dir}/ - use --resume to continue")
             break
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n⚠️ Agent interrupted")
-            print(f"💾 State saved to {workspace_dir}/.memory/ - use --resume to continue")
-            break
+            print(f"💾 State saved to {memory_dir}/ - use --resume to continue")
+            raise
         except Exception as e:
             print(f"\n❌ Error: {e}")
             return 1
@@ -746,36 +1148,208 @@ def run_agent(objective, workspace=None, resume=False, timeout=None, max_restart
     
     return 0
 
+def load_batch(batch_path):
+    """Load one objective per non-empty line from a batch file"""
+    with open(batch_path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _ignore_interrupt():
+    """Pool initializer: idle workers leave Ctrl-C to the agents they run"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _run_batch_objective(objective, timeout=None):
+    """Process-pool worker for --batch --jobs"""
+    return run_agent(objective, timeout=timeout, log_output=True)
+
+def run_batch_in_pool(objectives, jobs, timeout=None):
+    """Run objectives on at most `jobs` worker processes
+    
+    Returns one exit code per objective, or None for objectives that were
+    never started because Ctrl-C stopped the batch.
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    import multiprocessing
+    
+    # Running workers get the same Ctrl-C and checkpoint their own agents;
+    # the parent just stops handing out objectives
+    interrupted = []
+    def stop_submitting(signum, frame):
+        interrupted.append(signum)
+    
+    results = [None] * len(objectives)
+    previous_handler = signal.signal(signal.SIGINT, stop_submitting)
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_ignore_interrupt) as ex:
+            # Submit only as many objectives as can run, so nothing sits queued
+            pending = {}
+            next_index = 0
+            while pending or (next_index < len(objectives) and not interrupted):
+                while next_index < len(objectives) and len(pending) < jobs and not interrupted:
+                    future = ex.submit(_run_batch_objective, objectives[next_index], timeout)
+                    pending[future] = next_index
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    return results
+
+def run_batch(batch_path, timeout=None, jobs=None):
+    """Launch every objective in a batch file concurrently"""
+    try:
+        objectives = load_batch(batch_path)
+    except OSError as e:
+        print(f"❌ Can't read batch file: {e}")
+        return 1
+    if not objectives:
+        print(f"❌ No objectives found in {batch_path}")
+        return 1
+    
+    if jobs is not None:
+        print(f"🚀 Launching {len(objectives)} autonomous agents, {jobs} at a time...")
+    else:
+        print(f"🚀 Launching {len(objectives)} autonomous agents in parallel...")
+    print("-" * 50)
+    
+    # Agents run concurrently, so each logs Claude's output to its own
+    # workspace instead of interleaving on the terminal
+    async def run_all():
+        import asyncio
+        return await asyncio.gather(*[
+            run_agent_async(objective, timeout=timeout, log_output=True)
+            for objective in objectives
+        ])
+    
+    if jobs is not None:
+        results = run_batch_in_pool(objectives, jobs, timeout)
+    else:
+        try:
+            results = run_until_complete(run_all())
+        except KeyboardInterrupt:
+            return 0  # Each agent already reported where its state was saved
+    
+    skipped = [objective for objective, returncode in zip(objectives, results) if returncode is None]
+    if skipped:
+        print(f"\n⏭️ Ctrl-C: skipped {len(skipped)} objectives that had not started:")
+        for objective in skipped:
+            print(f"  • {objective}")
+    
+    ran = len(objectives) - len(skipped)
+    failed = sum(1 for returncode in results if returncode not in (0, None))
+    print(f"\n🏁 Batch finished: {ran - failed}/{ran} agents ran without errors")
+    return 1 if failed or skipped else 0
+
+# Cached objective heads for --list, kept in the workspace base
+WORKSPACE_INDEX = ".index.json"
+
+def load_workspace_index(workspace_base):
+    """Load the --list cache, or an empty one if missing or unreadable"""
+    import json
+    try:
+        with open(os.path.join(workspace_base, WORKSPACE_INDEX)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+def save_workspace_index(workspace_base, index):
+    """Atomically replace the --list cache; a read-only base just skips it"""
+    import json
+    index_path = os.path.join(workspace_base, WORKSPACE_INDEX)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        remove_file(tmp_path)
+
+def list_workspaces():
+    """Print existing workspaces with the first line of their objective"""
+    workspace_base = get_default_workspace_base()
+    if workspace_base.exists():
+        print("📂 Existing workspaces:")
+        with os.scandir(workspace_base) as it:
+            entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        
+        # One stat per workspace; objective.md is only opened when it changed
+        index = load_workspace_index(workspace_base)
+        fresh_index = {}
+        for entry in entries:
+            obj_path = os.path.join(entry.path, ".memory", "core", "objective.md")
+            try:
+                mtime = os.stat(obj_path).st_mtime_ns
+            except OSError:
+                obj = None
+            else:
+                cached = index.get(entry.name)
+                if isinstance(cached, dict) and cached.get("mtime") == mtime:
+                    obj = cached.get("objective")
+                else:
+                    obj = read_objective_head(entry.path)
+                if obj is not None:
+                    fresh_index[entry.name] = {"mtime": mtime, "objective": obj}
+            
+            if obj is not None:
+                print(f"  • {entry.name}: {obj}...")
+            else:
+                print(f"  • {entry.name}: (no objective)")
+        
+        if fresh_index != index:
+            save_workspace_index(workspace_base, fresh_index)
+    else:
+        print("No workspaces found")
+    return 0
+
+RESUME_OBJECTIVE = "Resuming from saved state"
+
 def main():
+    # Fast path: bare --list / --resume don't need a full argument parser
+    argv = sys.argv[1:]
+    if argv == ["--list"]:
+        return list_workspaces()
+    if argv == ["--resume"]:
+        return run_agent(RESUME_OBJECTIVE, resume=True)
+    
+    import argparse
     parser = argparse.ArgumentParser(description="Launch an autonomous Claude agent")
     parser.add_argument("objective", nargs="?", help="Objective to complete (string or file path)")
     parser.add_argument("--workspace", "-w", help="Workspace directory for this task")
     parser.add_argument("--resume", action="store_true", help="Resume from saved state")
     parser.add_argument("--timeout", type=int, help="Timeout in seconds")
+    parser.add_argument("--max-restarts", type=int, metavar="N",
+                        help="Maximum auto-restarts (default: 5; 1 without --timeout runs claude in place)")
     parser.add_argument("--list", action="store_true", help="List existing workspaces")
+    parser.add_argument("--batch", metavar="FILE", help="Run each objective in FILE (one per line) in parallel")
+    parser.add_argument("--jobs", "-j", type=int, metavar="N", help="With --batch, run at most N agents at once")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.batch:
+        # Every batch objective gets a fresh workspace and the default restarts
+        for option, given in (("an objective", args.objective), ("--resume", args.resume),
+                              ("--workspace", args.workspace),
+                              ("--max-restarts", args.max_restarts is not None)):
+            if given:
+                parser.error(f"--batch can't be combined with {option}")
+    if args.max_restarts is not None and args.max_restarts < 1:
+        parser.error("--max-restarts must be at least 1")
+    if args.jobs is not None:
+        if not args.batch:
+            parser.error("--jobs requires --batch")
+        if args.jobs < 1:
+            parser.error("--jobs must be at least 1")
     
     # List workspaces if requested
     if args.list:
-        workspace_base = get_default_workspace_base()
-        if workspace_base.exists():
-            print("📂 Existing workspaces:")
-            for dir in sorted(workspace_base.iterdir()):
-                if dir.is_dir():
-                    obj_file = dir / ".memory" / "core" / "objective.md"
-                    if obj_file.exists():
-                        with open(obj_file) as f:
-                            obj = f.readline().strip()[:50]
-                        print(f"  • {dir.name}: {obj}...")
-                    else:
-                        print(f"  • {dir.name}: (no objective)")
-        else:
-            print("No workspaces found")
-        return 0
+        return list_workspaces()
+    
+    if args.batch:
+        return run_batch(args.batch, args.timeout, args.jobs)
     
     if args.resume:
-        objective = "Resuming from saved state"
+        objective = RESUME_OBJECTIVE
     elif args.objective:
         objective = load_objective(args.objective)
     else:
@@ -783,7 +1357,8 @@ def main():
         parser.print_help()
         return 1
     
-    return run_agent(objective, args.workspace, args.resume, args.timeout)
+    max_restarts = 5 if args.max_restarts is None else args.max_restarts
+    return run_agent(objective, args.workspace, args.resume, args.timeout, max_restarts)
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -3,10 +3,9 @@
 Memory template helpers for the agent
 """
 
-from datetime import datetime
-
 def create_objective_template(objective):
     """Create initial objective memory"""
+    from datetime import datetime  # Only needed here; keeps importing this module cheap
     return f"""# Project Objective
 
 ## Main Goal